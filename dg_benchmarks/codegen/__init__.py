@@ -3,28 +3,26 @@ Helpers to generate python code compatible with any
 :class:`~arraycontext.ArrayContext`\ 's compile method.
 
 .. autoclass:: SuiteGeneratingArraycontext
+.. autofunction:: format_generated_sources
 """
 
 import os
 import ast
 import pytato as pt
 import numpy as np
-import re
-import sys
 
+from functools import cache
 from pytools import memoize_method
 from arraycontext import is_array_container_type
 from arraycontext.container.traversal import (rec_keyed_map_array_container,
                                               rec_multimap_array_container,
                                               rec_map_array_container)
-from typing import Callable, Any, Type, Dict, FrozenSet
+from typing import Callable, Any, Type, Dict, FrozenSet, Optional, Mapping
+from types import ModuleType
 from arraycontext.impl.pytato.compile import (BaseLazilyCompilingFunctionCaller,
                                               CompiledFunction)
 from dg_benchmarks.utils import get_dg_benchmarks_path, is_dataclass_array_container
 from meshmode.dof_array import array_context_for_pickling
-import autoflake
-import black
-from pathlib import Path
 from meshmode.array_context import (
     # TODO rename FusionContractorArrayContext to
     # BatchedEinsumPytatoPyOpenCLArrayContext when mirgecom production
@@ -48,6 +46,241 @@ def remove_tags_with_typenames(expr: pt.DictOfNamedArrays,
 
 
 BAD_TAG_TYPENAMES = frozenset(["NameHint", "FEMEinsumTag"])
+# Modules of the generated host code executed in this process, keyed by a
+# name derived from the digest of their source.
+_GENERATED_MODULE_NAME_TO_MODULE: Dict[str, ModuleType] = {}
+# Datawrappers larger than these many bytes are stored compressed.
+_DATAWRAPPERS_COMPRESSION_THRESHOLD = 32 << 20
+
+
+def format_generated_sources(*main_file_paths: str) -> None:
+    """
+    Runs :mod:`black` on the generated host code files at *main_file_paths*.
+    Purely cosmetic, the generated code is runnable without this.
+    """
+    import black
+    from pathlib import Path
+
+    for main_file_path in main_file_paths:
+        black.format_file_in_place(Path(main_file_path),
+                                   fast=False,
+                                   mode=black.Mode(line_length=80),
+                                   write_back=black.WriteBack.YES)
+
+
+@cache
+def _get_codegen_sources_digest() -> str:
+    """
+    Returns a digest of the sources of the modules that generate the host
+    code, so that changes to the code generator invalidate the codegen cache.
+    """
+    import hashlib
+    from dg_benchmarks.codegen import pytato_target
+
+    hasher = hashlib.blake2b()
+
+    for filepath in [__file__, pytato_target.__file__]:
+        with open(filepath, "rb") as fp:
+            hasher.update(fp.read())
+
+    return hasher.hexdigest()
+
+
+def _get_generated_module_name(host_code: bytes) -> str:
+    import hashlib
+    return f"_gen_{hashlib.blake2b(host_code, digest_size=8).hexdigest()}"
+
+
+# {{{ skip rewriting unchanged files
+
+def _get_digest_path(filepath: str) -> str:
+    return f"{filepath}.sha"
+
+
+def _get_file_stamp(filepath: str) -> str:
+    stat = os.stat(filepath)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _is_up_to_date(filepath: str, digest: str) -> bool:
+    """
+    Returns *True* only if *filepath* was last written with contents whose
+    digest is *digest* and has not been modified since (for ex. by replacing
+    it with a downloaded file).
+    """
+    try:
+        with open(_get_digest_path(filepath)) as fp:
+            recorded_digest_and_stamp = fp.read()
+        return (recorded_digest_and_stamp
+                == f"{digest} {_get_file_stamp(filepath)}")
+    except OSError:
+        return False
+
+
+def _record_digest(filepath: str, digest: str) -> None:
+    with open(_get_digest_path(filepath), "w") as fp:
+        fp.write(f"{digest} {_get_file_stamp(filepath)}")
+
+
+def _write_if_changed(filepath: str, data: bytes) -> None:
+    import hashlib
+
+    digest = hashlib.blake2b(data).hexdigest()
+
+    if _is_up_to_date(filepath, digest):
+        # bump the modification time, so that the codegen cache considers the
+        # file as fresh as the rewritten ones.
+        os.utime(filepath)
+    else:
+        with open(filepath, "wb") as fp:
+            fp.write(data)
+
+    _record_digest(filepath, digest)
+
+
+def _get_numpy_arrays_digest(name_to_ary: Mapping[str, np.ndarray]) -> str:
+    import hashlib
+
+    hasher = hashlib.blake2b()
+
+    for name, ary in sorted(name_to_ary.items()):
+        hasher.update(f"{name}:{ary.dtype.str}:{ary.shape}".encode())
+        hasher.update(np.ascontiguousarray(ary).data)
+
+    return hasher.hexdigest()
+
+# }}}
+
+
+# {{{ host code templates
+
+# Emitted verbatim after the import statements of the generated program.
+_HOST_CODE_PRELUDE = """\
+from pytools import memoize_method
+from functools import cached_property
+from immutables import Map
+from arraycontext import ArrayContext, is_array_container_type
+from dataclasses import dataclass
+from arraycontext.container.traversal import (rec_map_array_container,
+                                              rec_keyed_map_array_container)
+from dg_benchmarks.utils import get_dg_benchmarks_path
+"""
+
+# Emitted after the generated function definition. Formatted with the paths
+# (relative to the install location of dg_benchmarks) of the datawrappers and
+# the reference output, and the argument names of the generated function.
+_RHS_INVOKER_TEMPLATE = """\
+@dataclass(frozen=True)
+class RHSInvoker:
+    actx: ArrayContext
+
+    @cached_property
+    def npzfile(self):
+        from immutables import Map
+        import os
+
+        # arrays in the archive are read one at a time while transferring them
+        # to the device, the archive is closed once all are transferred.
+        with np.load(os.path.join(get_dg_benchmarks_path(),
+                                  "{datawrappers_path}"),
+                     allow_pickle=False) as kw_to_ary:
+            return Map({{kw: self.actx.freeze(self.actx.from_numpy(ary))
+                        for kw, ary in kw_to_ary.items()}})
+
+    @memoize_method
+    def _get_compiled_rhs_inner(self):
+        return self.actx.compile(
+            lambda *args, **kwargs: _rhs_inner(self.actx, self.npzfile, *args, **kwargs))
+
+    @memoize_method
+    def _get_output_template(self):
+        import os
+        import pytato as pt
+        from pickle import load
+        from meshmode.dof_array import array_context_for_pickling
+
+        fpath = os.path.join(get_dg_benchmarks_path(),
+                             "{ref_output_path}")
+        with open(fpath, "rb") as fp:
+            with array_context_for_pickling(self.actx):
+                output_template = load(fp)
+
+        def _convert_to_symbolic_array(ary):
+            return pt.zeros(ary.shape, ary.dtype)
+
+        # convert to symbolic array to not free the memory corresponding to
+        # output_template
+        return rec_map_array_container(_convert_to_symbolic_array,
+                                       output_template)
+
+    @memoize_method
+    def _get_key_to_pos_in_output_template(self):
+        from arraycontext.impl.pytato.compile import (
+            _ary_container_key_stringifier)
+
+        output_keys = set()
+        output_template = self._get_output_template()
+
+        def _as_dict_of_named_arrays(keys, ary):
+            output_keys.add(keys)
+            return ary
+
+        rec_keyed_map_array_container(_as_dict_of_named_arrays,
+                                      output_template)
+
+        return Map({{output_key: i
+                    for i, output_key in enumerate(sorted(
+                            output_keys, key=_ary_container_key_stringifier))}})
+
+    @cached_property
+    def _rhs_inner_argument_names(self):
+        return {{
+            {rhs_inner_argument_names}
+        }}
+
+    @memoize_method
+    def _get_rhs_inner_kws_and_arg_ids(self, arg_ids):
+        from arraycontext.impl.pytato.compile import (
+            _ary_container_key_stringifier)
+
+        kw_to_arg_id = {{
+            "_actx_in_" + _ary_container_key_stringifier(arg_id): arg_id
+            for arg_id in arg_ids}}
+
+        return tuple((kw, kw_to_arg_id[kw])
+                     for kw in sorted(self._rhs_inner_argument_names))
+
+    def __call__(self, *args, **kwargs):
+        from arraycontext.impl.pytato.compile import (
+            _get_arg_id_to_arg_and_arg_id_to_descr)
+        arg_id_to_arg, _ = _get_arg_id_to_arg_and_arg_id_to_descr(args, kwargs)
+        input_kwargs_to_rhs_inner = {{
+            kw: arg_id_to_arg[arg_id]
+            for kw, arg_id in self._get_rhs_inner_kws_and_arg_ids(
+                tuple(arg_id_to_arg))
+        }}
+
+        compiled_rhs_inner = self._get_compiled_rhs_inner()
+        result_as_np_obj_array = compiled_rhs_inner(**input_kwargs_to_rhs_inner)
+
+        output_template = self._get_output_template()
+
+        if is_array_container_type(output_template.__class__):
+            keys_to_pos = self._get_key_to_pos_in_output_template()
+
+            def to_output_template(keys, _):
+                return result_as_np_obj_array[keys_to_pos[keys]]
+
+            return rec_keyed_map_array_container(to_output_template,
+                                                 self._get_output_template())
+        else:
+            from pytato.array import Array
+            assert isinstance(output_template, Array)
+            assert result_as_np_obj_array.shape == (1,)
+            return result_as_np_obj_array[0]
+"""  # noqa: E501
+
+# }}}
 
 
 class LazilyArraycontextCompilingFunctionCaller(BaseLazilyCompilingFunctionCaller):
@@ -73,6 +306,157 @@ class LazilyArraycontextCompilingFunctionCaller(BaseLazilyCompilingFunctionCalle
         # not rely on us overriding these routines.
         raise NotImplementedError
 
+    @property
+    def _codegen_cache_path(self) -> str:
+        """
+        Path to the JSON sidecar mapping the keys of the codegen cache to
+        :attr:`SuiteGeneratingArraycontext.main_file_path`.
+        """
+        return (os.path.splitext(self.actx.main_file_path)[0]
+                + "_codegen_cache.json")
+
+    def _get_codegen_cache_key(self, arg_id_to_descr) -> Optional[str]:
+        """
+        Returns a key that identifies the code generated for
+        :attr:`BaseLazilyCompilingFunctionCaller.f` invoked with arguments
+        described by *arg_id_to_descr*. Returns *None* if the source of the
+        function is unavailable, in which case the codegen is not cached.
+
+        The key also depends on the paths of the generated files (the host
+        code refers to the datawrappers and reference output by their paths),
+        on :attr:`SuiteGeneratingArraycontext.verify_codegen` as it determines
+        whether the stored reference output is the actual output, and on the
+        sources of this package's code generator.
+
+        .. warning::
+
+            Values captured by the function (for ex. in its closure, or as
+            globals) and the code it calls into (for ex. :mod:`grudge`,
+            :mod:`meshmode`, :mod:`pytato`) are not part of the key. Changing
+            them without changing the source of the function or the argument
+            descriptors leads to stale generated code and datawrappers being
+            used. Pass *use_codegen_cache=False* to
+            :class:`SuiteGeneratingArraycontext` or remove the sidecar at
+            :attr:`_codegen_cache_path` in such cases.
+        """
+        import hashlib
+        import inspect
+
+        try:
+            f_source = inspect.getsource(self.f)
+        except (OSError, TypeError):
+            return None
+
+        key_components = [self.f.__qualname__,
+                          f_source,
+                          self.actx.main_file_path,
+                          self.actx.datawrappers_path,
+                          self.actx.pickled_ref_input_args_path,
+                          self.actx.pickled_ref_output_path,
+                          f"verify_codegen={self.actx.verify_codegen}",
+                          _get_codegen_sources_digest(),
+                          *sorted(repr(arg_id_and_descr)
+                                  for arg_id_and_descr in arg_id_to_descr.items())]
+
+        return hashlib.sha256("\n".join(key_components).encode()).hexdigest()
+
+    def _read_codegen_cache(self) -> Dict[str, str]:
+        import json
+
+        try:
+            with open(self._codegen_cache_path) as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return {}
+
+    def _is_codegen_cached(self, key: Optional[str]) -> bool:
+        """
+        Returns *True* only if the generated files on disk correspond to *key*
+        and are newer than the source file of
+        :attr:`BaseLazilyCompilingFunctionCaller.f`.
+        """
+        import inspect
+
+        if key is None:
+            return False
+
+        if self._read_codegen_cache().get(key) != self.actx.main_file_path:
+            return False
+
+        try:
+            t_source = os.path.getmtime(inspect.getsourcefile(self.f))
+            return all(os.path.getmtime(filepath) > t_source
+                       for filepath in [self.actx.main_file_path,
+                                        self.actx.datawrappers_path,
+                                        self.actx.pickled_ref_input_args_path,
+                                        self.actx.pickled_ref_output_path])
+        except (OSError, TypeError):
+            return False
+
+    def _record_codegen_cache(self, key: Optional[str]) -> None:
+        import json
+
+        if key is None:
+            return
+
+        # entries pointing to main_file_path are now stale => drop them.
+        key_to_main_file_path = {
+            other_key: filepath
+            for other_key, filepath in self._read_codegen_cache().items()
+            if filepath != self.actx.main_file_path}
+        key_to_main_file_path[key] = self.actx.main_file_path
+
+        with open(self._codegen_cache_path, "w") as fp:
+            json.dump(key_to_main_file_path, fp, indent=2)
+
+    def _get_compiled_func(self, host_code: str) -> Callable[..., Any]:
+        """
+        Executes the generated *host_code* as a module and returns the instance
+        of its ``RHSInvoker`` bound to a clone of :attr:`actx`. The execution
+        is skipped if the same host code was executed earlier in the process.
+        """
+        import importlib.util
+
+        module_name = _get_generated_module_name(host_code.encode())
+
+        try:
+            module = _GENERATED_MODULE_NAME_TO_MODULE[module_name]
+        except KeyError:
+            code_obj = compile(host_code, self.actx.main_file_path, "exec")
+            module = importlib.util.module_from_spec(
+                importlib.util.spec_from_loader(
+                    module_name, loader=None, origin=self.actx.main_file_path))
+            module._MODULE_SOURCE_CODE = host_code  # helps pudb
+            exec(code_obj, module.__dict__)
+            _GENERATED_MODULE_NAME_TO_MODULE[module_name] = module
+
+        return module.RHSInvoker(self.actx.clone())
+
+    def _load_compiled_func(self) -> Callable[..., Any]:
+        """
+        Imports the host code previously written to
+        :attr:`SuiteGeneratingArraycontext.main_file_path` and returns the
+        instance of its ``RHSInvoker`` bound to a clone of :attr:`actx`. Unlike
+        :meth:`_get_compiled_func`, the import goes through :mod:`importlib`'s
+        file loader which re-uses the bytecode cached on disk.
+        """
+        import importlib.util
+
+        with open(self.actx.main_file_path, "rb") as fp:
+            module_name = _get_generated_module_name(fp.read())
+
+        try:
+            module = _GENERATED_MODULE_NAME_TO_MODULE[module_name]
+        except KeyError:
+            spec = importlib.util.spec_from_file_location(
+                module_name, self.actx.main_file_path)
+            assert spec is not None and spec.loader is not None
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _GENERATED_MODULE_NAME_TO_MODULE[module_name] = module
+
+        return module.RHSInvoker(self.actx.clone())
+
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         """
         Performs the following operations:
@@ -82,6 +466,10 @@ class LazilyArraycontextCompilingFunctionCaller(BaseLazilyCompilingFunctionCalle
         #. Compiles the generated code and executes it with the arguments
             *args*, *kwargs* and returns the output.
 
+        Code generation is skipped if the files on disk were generated for the
+        same function and argument descriptors by an earlier invocation,
+        possibly from another process.
+
         .. note::
 
             The behavior of this routine emulates calling :attr:`f` itself.
@@ -120,7 +508,16 @@ class LazilyArraycontextCompilingFunctionCaller(BaseLazilyCompilingFunctionCalle
         except KeyError:
             pass
         else:
-            return compiled_f(arg_id_to_arg)
+            return compiled_f(*args, **kwargs)
+
+        codegen_cache_key = (self._get_codegen_cache_key(arg_id_to_descr)
+                             if self.actx.use_codegen_cache
+                             else None)
+
+        if self._is_codegen_cached(codegen_cache_key):
+            compiled_f = self._load_compiled_func()
+            self.program_cache[arg_id_to_descr] = compiled_f
+            return compiled_f(*args, **kwargs)
 
         dict_of_named_arrays = {}
         input_id_to_name_in_program = {
@@ -145,13 +542,17 @@ class LazilyArraycontextCompilingFunctionCaller(BaseLazilyCompilingFunctionCalle
                 "did not return an array container or pt.Array,"
                 f" but an instance of '{output_template.__class__}' instead.")
 
-        def _as_dict_of_named_arrays(keys, ary):
-            name = "_pt_out_" + _ary_container_key_stringifier(keys)
-            dict_of_named_arrays[name] = ary
-            return ary
+        if isinstance(output_template, pt.Array):
+            dict_of_named_arrays["_pt_out_" + _ary_container_key_stringifier(())
+                                 ] = output_template
+        else:
+            def _as_dict_of_named_arrays(keys, ary):
+                name = "_pt_out_" + _ary_container_key_stringifier(keys)
+                dict_of_named_arrays[name] = ary
+                return ary
 
-        rec_keyed_map_array_container(
-            _as_dict_of_named_arrays, output_template)
+            rec_keyed_map_array_container(
+                _as_dict_of_named_arrays, output_template)
 
         from .pytato_target import generate_arraycontext_code
         pt_dict_of_named_arrays = pt.transform.deduplicate_data_wrappers(
@@ -165,224 +566,128 @@ class LazilyArraycontextCompilingFunctionCaller(BaseLazilyCompilingFunctionCalle
                                                     actx=self.actx,
                                                     show_code=False)
 
-        host_code = f"""
-        {ast.unparse(ast.fix_missing_locations(
-            ast.Module(list(inner_code_prg.import_statements), type_ignores=[])))}
-        from pytools import memoize_method
-        from functools import cached_property
-        from immutables import Map
-        from arraycontext import ArrayContext, is_array_container_type
-        from dataclasses import dataclass
-        from arraycontext.container.traversal import (rec_map_array_container,
-                                                      rec_keyed_map_array_container)
-        from dg_benchmarks.utils import get_dg_benchmarks_path
-
-
-        {ast.unparse(ast.fix_missing_locations(
-            ast.Module([inner_code_prg.function_def], type_ignores=[])))}
-
-
-        @dataclass(frozen=True)
-        class RHSInvoker:
-            actx: ArrayContext
-
-            @cached_property
-            def npzfile(self):
-                from immutables import Map
-                import os
-
-                kw_to_ary = np.load(
-                    os.path.join(get_dg_benchmarks_path(),
-                                 "{os.path.relpath(self.actx.datawrappers_path,
-                                                   start=get_dg_benchmarks_path())}")
-                )
-                return Map({{kw: self.actx.freeze(self.actx.from_numpy(ary))
-                            for kw, ary in kw_to_ary.items()}})
-
-            @memoize_method
-            def _get_compiled_rhs_inner(self):
-                return self.actx.compile(
-                    lambda *args, **kwargs: _rhs_inner(self.actx, self.npzfile, *args, **kwargs))
-
-            @memoize_method
-            def _get_output_template(self):
-                import os
-                import pytato as pt
-                from pickle import load
-                from meshmode.dof_array import array_context_for_pickling
-
-                fpath = os.path.join(get_dg_benchmarks_path(),
-                                    "{os.path.relpath(self.actx.pickled_ref_output_path,
-                                                      start=get_dg_benchmarks_path())}")
-                with open(fpath, "rb") as fp:
-                    with array_context_for_pickling(self.actx):
-                        output_template = load(fp)
-
-                def _convert_to_symbolic_array(ary):
-                    return pt.zeros(ary.shape, ary.dtype)
-
-                # convert to symbolic array to not free the memory corresponding to
-                # output_template
-                return rec_map_array_container(_convert_to_symbolic_array,
-                                               output_template)
-
-            @memoize_method
-            def _get_key_to_pos_in_output_template(self):
-                from arraycontext.impl.pytato.compile import (
-                    _ary_container_key_stringifier)
-
-                output_keys = set()
-                output_template = self._get_output_template()
-
-                def _as_dict_of_named_arrays(keys, ary):
-                    output_keys.add(keys)
-                    return ary
-
-                rec_keyed_map_array_container(_as_dict_of_named_arrays,
-                                              output_template)
-
-                return Map({{output_key: i
-                            for i, output_key in enumerate(sorted(
-                                    output_keys, key=_ary_container_key_stringifier))}})
-
-            @cached_property
-            def _rhs_inner_argument_names(self):
-                return {{
-                    '{"', '".join(sorted(inner_code_prg.argument_names))}'
-                }}
-
-            def __call__(self, *args, **kwargs):
-                from arraycontext.impl.pytato.compile import (
-                    _get_arg_id_to_arg_and_arg_id_to_descr,
-                    _ary_container_key_stringifier)
-                arg_id_to_arg, _ = _get_arg_id_to_arg_and_arg_id_to_descr(args, kwargs)
-                input_kwargs_to_rhs_inner = {{
-                    "_actx_in_" + _ary_container_key_stringifier(arg_id): arg
-                    for arg_id, arg in arg_id_to_arg.items()}}
-
-                input_kwargs_to_rhs_inner = {{
-                    kw: input_kwargs_to_rhs_inner[kw]
-                    for kw in self._rhs_inner_argument_names
-                }}
-
-                compiled_rhs_inner = self._get_compiled_rhs_inner()
-                result_as_np_obj_array = compiled_rhs_inner(**input_kwargs_to_rhs_inner)
-
-                output_template = self._get_output_template()
-
-                if is_array_container_type(output_template.__class__):
-                    keys_to_pos = self._get_key_to_pos_in_output_template()
-
-                    def to_output_template(keys, _):
-                        return result_as_np_obj_array[keys_to_pos[keys]]
-
-                    return rec_keyed_map_array_container(to_output_template,
-                                                         self._get_output_template())
-                else:
-                    from pytato.array import Array
-                    assert isinstance(output_template, Array)
-                    assert result_as_np_obj_array.shape == (1,)
-                    return result_as_np_obj_array[0]
-        """  # noqa: E501
-        host_code = re.sub(r"^        (?P<rest_of_line>.+)$", r"\g<rest_of_line>",
-                           host_code, flags=re.MULTILINE)
-
-        from pytools.codegen import remove_common_indentation
-        host_code = remove_common_indentation(host_code)
+        bench_root = get_dg_benchmarks_path()
+        datawrappers_relpath = os.path.relpath(self.actx.datawrappers_path,
+                                               start=bench_root)
+        ref_output_relpath = os.path.relpath(self.actx.pickled_ref_output_path,
+                                             start=bench_root)
+
+        host_code = "".join([
+            *(f"{ast.unparse(stmt)}\n"
+              for stmt in inner_code_prg.import_statements),
+            _HOST_CODE_PRELUDE,
+            "\n\n",
+            ast.unparse(inner_code_prg.function_def),
+            "\n\n\n",
+            _RHS_INVOKER_TEMPLATE.format(
+                datawrappers_path=datawrappers_relpath,
+                ref_output_path=ref_output_relpath,
+                rhs_inner_argument_names=", ".join(
+                    repr(name)
+                    for name in sorted(inner_code_prg.argument_names))),
+        ])
 
         with open(f"{self.actx.main_file_path}", "w") as fp:
             fp.write(host_code)
 
-        autoflake._main(["--remove-unused-variables",
-                         "--imports", "loopy,arraycontext",
-                         "--in-place",
-                         self.actx.main_file_path,
-                         ],
-                        standard_out=None,
-                        standard_error=sys.stderr,
-                        standard_input=sys.stdin,
-                        )
-        black.format_file_in_place(Path(self.actx.main_file_path),
-                                   fast=False,
-                                   mode=black.Mode(line_length=80),
-                                   write_back=black.WriteBack.YES)
+        if self.actx.format_output:
+            format_generated_sources(self.actx.main_file_path)
 
-        with open(f"{self.actx.datawrappers_path}", "wb") as fp:
-            np.savez(fp, **inner_code_prg.numpy_arrays_to_store)
-
-        with open(f"{self.actx.pickled_ref_input_args_path}", "wb") as fp:
-            import pickle
-
-            if (all((is_dataclass_array_container(arg)
-                        or (isinstance(arg, np.ndarray)
-                            and arg.dtype == "O"
-                            and all(is_dataclass_array_container(el)
-                                    for el in arg))
-                        or np.isscalar(arg))
-                    for arg in args)
-                    and all((is_dataclass_array_container(arg)
-                                or (isinstance(arg, np.ndarray)
-                                    and arg.dtype == "O"
-                                    and all(is_dataclass_array_container(el)
-                                            for el in arg))
-                                or np.isscalar(arg))
-                            for arg in kwargs.values())):
-                with array_context_for_pickling(self.actx.clone()):
-                    pickle.dump((args, kwargs), fp)
-            elif (any(is_dataclass_array_container(arg) for arg in args)
-                    or any(is_dataclass_array_container(arg)
-                           for arg in kwargs.values())):
-                raise NotImplementedError("Pickling not implemented for input"
-                                          " types.")
-            else:
-                np_args = tuple(self.actx.to_numpy(arg)
-                                for arg in args)
-                np_kwargs = {kw: self.actx.to_numpy(arg)
-                             for kw, arg in kwargs.items()}
-                pickle.dump((np_args, np_kwargs), fp)
-
-        ref_out = self.actx.thaw(self.actx.freeze(self.f(*args, **kwargs)))
-        ref_out = rec_map_array_container(_remove_bad_tags, ref_out)
-
-        with open(f"{self.actx.pickled_ref_output_path}", "wb") as fp:
-            import pickle
-            if (is_dataclass_array_container(ref_out)
-                    or (isinstance(ref_out, np.ndarray)
-                        and ref_out.dtype == "O"
-                        and all(is_dataclass_array_container(el)
-                                for el in ref_out))):
-                with array_context_for_pickling(self.actx.clone()):
-                    pickle.dump(ref_out, fp)
-            else:
-                pickle.dump(self.actx.to_numpy(ref_out), fp)
+        datawrappers_digest = _get_numpy_arrays_digest(
+            inner_code_prg.numpy_arrays_to_store)
+        if _is_up_to_date(self.actx.datawrappers_path, datawrappers_digest):
+            os.utime(self.actx.datawrappers_path)
+        else:
+            total_nbytes = sum(ary.nbytes for ary in
+                               inner_code_prg.numpy_arrays_to_store.values())
+            savez = (np.savez_compressed
+                     if total_nbytes > _DATAWRAPPERS_COMPRESSION_THRESHOLD
+                     else np.savez)
+            with open(f"{self.actx.datawrappers_path}", "wb") as fp:
+                savez(fp, **inner_code_prg.numpy_arrays_to_store)
 
-        self_actx_clone = self.actx.clone()
+        _record_digest(self.actx.datawrappers_path, datawrappers_digest)
 
-        # {{{ get 'rhs' callable
+        import pickle
 
-        variables_after_execution: Dict[str, Any] = {
-            "_MODULE_SOURCE_CODE": host_code,  # helps pudb
-        }
-        exec(host_code, variables_after_execution)
-        compiled_func = variables_after_execution["RHSInvoker"](
-            self_actx_clone)
+        if (all((is_dataclass_array_container(arg)
+                    or (isinstance(arg, np.ndarray)
+                        and arg.dtype == "O"
+                        and all(is_dataclass_array_container(el)
+                                for el in arg))
+                    or np.isscalar(arg))
+                for arg in args)
+                and all((is_dataclass_array_container(arg)
+                            or (isinstance(arg, np.ndarray)
+                                and arg.dtype == "O"
+                                and all(is_dataclass_array_container(el)
+                                        for el in arg))
+                            or np.isscalar(arg))
+                        for arg in kwargs.values())):
+            with array_context_for_pickling(self.actx.clone()):
+                pickled_ref_input_args = pickle.dumps((args, kwargs))
+        elif (any(is_dataclass_array_container(arg) for arg in args)
+                or any(is_dataclass_array_container(arg)
+                       for arg in kwargs.values())):
+            raise NotImplementedError("Pickling not implemented for input"
+                                      " types.")
+        else:
+            np_args = tuple(self.actx.to_numpy(arg)
+                            for arg in args)
+            np_kwargs = {kw: self.actx.to_numpy(arg)
+                         for kw, arg in kwargs.items()}
+            pickled_ref_input_args = pickle.dumps((np_args, np_kwargs))
+
+        _write_if_changed(self.actx.pickled_ref_input_args_path,
+                          pickled_ref_input_args)
+
+        if self.actx.verify_codegen:
+            ref_out = self.actx.thaw(self.actx.freeze(self.f(*args, **kwargs)))
+            ref_out = rec_map_array_container(_remove_bad_tags, ref_out)
+        else:
+            # The generated code only relies on the structure, shapes and
+            # dtypes of the reference output => avoid evaluating 'f'.
+            ref_out = self.actx.thaw(self.actx.freeze(
+                rec_map_array_container(
+                    lambda ary: self.actx.zeros(ary.shape, ary.dtype),
+                    output_template)))
+
+        if (is_dataclass_array_container(ref_out)
+                or (isinstance(ref_out, np.ndarray)
+                    and ref_out.dtype == "O"
+                    and all(is_dataclass_array_container(el)
+                            for el in ref_out))):
+            with array_context_for_pickling(self.actx.clone()):
+                pickled_ref_out = pickle.dumps(ref_out)
+        else:
+            pickled_ref_out = pickle.dumps(self.actx.to_numpy(ref_out))
 
-        # }}}
+        _write_if_changed(self.actx.pickled_ref_output_path, pickled_ref_out)
 
+        self_actx_clone = self.actx.clone()
+        if self.actx.format_output:
+            # the file on disk no longer matches the generated source => load
+            # the file so that tracebacks point to the right lines.
+            compiled_func = self._load_compiled_func()
+        else:
+            compiled_func = self._get_compiled_func(host_code)
         self.program_cache[arg_id_to_descr] = compiled_func
 
-        # {{{ test that the codegen was successful
-
         output = self.program_cache[arg_id_to_descr](*args, **kwargs)
 
-        rec_multimap_array_container(
-            np.testing.assert_allclose,
-            self_actx_clone.to_numpy(output),
-            self.actx.to_numpy(ref_out)
-        )
+        # {{{ test that the codegen was successful
+
+        if self.actx.verify_codegen:
+            rec_multimap_array_container(
+                np.testing.assert_allclose,
+                self_actx_clone.to_numpy(output),
+                self.actx.to_numpy(ref_out)
+            )
 
         # }}}
 
+        self._record_codegen_cache(codegen_cache_key)
+
         return output
 
 
@@ -392,6 +697,28 @@ class SuiteGeneratingArraycontext(BatchedEinsumArrayContext):
     :class:`arraycontext.PytatoJAXArrayContext` to generate python code that is
     compatible to run with any :class:`ArrayContext` and then executes the
     generated code.
+
+    .. attribute:: format_output
+
+        If *True*, the generated code is formatted via
+        :func:`format_generated_sources` after every compile. Defaults to
+        *False* as formatting dominates the time spent in code generation.
+
+    .. attribute:: verify_codegen
+
+        If *True*, the output of the generated code is compared against the
+        output of the traced function, which is then also stored as the
+        reference output. Otherwise, a zero-filled array container with the
+        same structure as the output is stored as the reference output.
+        Defaults to *False*.
+
+    .. attribute:: use_codegen_cache
+
+        If *True*, code generation is skipped when the files on disk were
+        generated for the same function, argument descriptors and paths.
+        Defaults to *True*. See
+        :meth:`LazilyArraycontextCompilingFunctionCaller._get_codegen_cache_key`
+        for what is not tracked by the cache.
     """
     def __init__(self,
                  queue,
@@ -401,6 +728,9 @@ class SuiteGeneratingArraycontext(BatchedEinsumArrayContext):
                  datawrappers_path: str,
                  pickled_ref_input_args_path: str,
                  pickled_ref_output_path: str,
+                 format_output: bool = False,
+                 verify_codegen: bool = False,
+                 use_codegen_cache: bool = True,
                  ) -> None:
 
         super().__init__(queue, allocator)
@@ -415,6 +745,9 @@ class SuiteGeneratingArraycontext(BatchedEinsumArrayContext):
         self.datawrappers_path = datawrappers_path
         self.pickled_ref_input_args_path = pickled_ref_input_args_path
         self.pickled_ref_output_path = pickled_ref_output_path
+        self.format_output = format_output
+        self.verify_codegen = verify_codegen
+        self.use_codegen_cache = use_codegen_cache
 
     def compile(self, f: Callable[..., Any]) -> Callable[..., Any]:
         if f.__name__ == "rhs":
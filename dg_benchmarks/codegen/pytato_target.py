@@ -670,6 +670,42 @@ class ArraycontextCodegenMapper(CachedMapper[ArrayOrNames]):
         return self._record_line_and_return_lhs(lhs, rhs)
 
 
+# Modules whose imports are emitted only if the generated function uses them.
+# Other imports (for ex. numpy) are also relied upon by the host code.
+_OPTIONAL_IMPORT_MODULES = frozenset({"loopy", "arraycontext"})
+
+
+def _get_names_in(nodes: Sequence[ast.AST]) -> FrozenSet[str]:
+    return frozenset(subnode.id
+                     for node in nodes
+                     for subnode in ast.walk(node)
+                     if isinstance(subnode, ast.Name))
+
+
+def _remove_dead_assignments(lines: Sequence[ast.stmt]) -> Tuple[ast.stmt, ...]:
+    """
+    Returns *lines* without the assignments to variables that are not read by
+    any of the succeeding lines.
+    """
+    live_vars: Set[str] = set()
+    new_lines_reversed: List[ast.stmt] = []
+
+    for line in reversed(lines):
+        if isinstance(line, ast.Assign):
+            target, = line.targets
+            assert isinstance(target, ast.Name)
+            if target.id not in live_vars:
+                continue
+            live_vars.discard(target.id)
+            live_vars.update(_get_names_in([line.value]))
+        else:
+            live_vars.update(_get_names_in([line]))
+
+        new_lines_reversed.append(line)
+
+    return tuple(reversed(new_lines_reversed))
+
+
 def _delete_arrays_post_live_interval(
         lines: Sequence[ast.expr], temp_vars: FrozenSet[str]
 ) -> Tuple[ast.expr, ...]:
@@ -743,8 +779,10 @@ def generate_arraycontext_code(
     lines = cgen_mapper.lines
     lines.append(ast.Return(ast.Name(result_var)))
 
+    lines = _remove_dead_assignments(lines)
     lines = _delete_arrays_post_live_interval(lines,
                                               frozenset(cgen_mapper.temp_var_names))
+    names_in_lines = _get_names_in(lines)
 
     # {{{ define the translation units
 
@@ -752,6 +790,10 @@ def generate_arraycontext_code(
 
     for t_unit, name in sorted(cgen_mapper.seen_tunits_to_names.items(),
                                key=lambda k_x_v: k_x_v[1]):
+        if name not in names_in_lines:
+            # only invoked in a dead assignment
+            continue
+
         knl = t_unit.default_entrypoint
         if len(knl.domains) != 1 and len(knl.instructions) != 1:
             raise NotImplementedError
@@ -840,6 +882,31 @@ def generate_arraycontext_code(
         decorator_list=[],
     )
 
+    # {{{ drop unused imports from loopy, arraycontext
+
+    names_in_function_def = _get_names_in([function_def])
+
+    def _is_import_needed(import_statement: ast.stmt) -> bool:
+        if isinstance(import_statement, ast.ImportFrom):
+            module_names = [import_statement.module]
+        else:
+            assert isinstance(import_statement, ast.Import)
+            module_names = [alias.name for alias in import_statement.names]
+
+        if not any(module_name.split(".")[0] in _OPTIONAL_IMPORT_MODULES
+                   for module_name in module_names):
+            return True
+
+        return any((alias.asname or alias.name.split(".")[0])
+                   in names_in_function_def
+                   for alias in import_statement.names)
+
+    import_statements = tuple(import_statement
+                              for import_statement in import_statements
+                              if _is_import_needed(import_statement))
+
+    # }}}
+
     if show_code:
         module = ast.Module(
             body=[*import_statements, function_def],
@@ -864,8 +931,13 @@ def generate_arraycontext_code(
         else:
             print(program)
 
+    # do not store the datawrappers whose thaws were dead assignments
+    numpy_arrays = Map({name: ary
+                        for name, ary in cgen_mapper.numpy_arrays.items()
+                        if name in names_in_lines})
+
     return ArraycontextProgram(import_statements,
                                function_def,
-                               Map(cgen_mapper.numpy_arrays),
+                               numpy_arrays,
                                frozenset(cgen_mapper.arg_names),
                                )
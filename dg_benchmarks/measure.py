@@ -11,20 +11,18 @@ from arraycontext import (ArrayContext, PyOpenCLArrayContext,
                           PytatoJAXArrayContext,
                           EagerJAXArrayContext,
                           rec_multimap_array_container)
-from typing import Type
+from typing import Any, Callable, Dict, Tuple, Type
 from dg_benchmarks.utils import (get_benchmark_rhs_invoker,
                                  get_benchmark_ref_input_arguments_path,
                                  get_benchmark_ref_output_path)
 
 from dg_benchmarks.perf_analysis import get_float64_flops
-from time import time
+from time import perf_counter_ns
+from itertools import repeat
 from meshmode.dof_array import array_context_for_pickling
 
 
 def _instantiate_actx_t(actx_t: Type[ArrayContext]) -> ArrayContext:
-    import gc
-    gc.collect()
-
     if issubclass(actx_t, (PyOpenCLArrayContext, PytatoPyOpenCLArrayContext)):
         import pyopencl as cl
         import pyopencl.tools as cl_tools
@@ -52,6 +50,72 @@ def _instantiate_actx_t(actx_t: Type[ArrayContext]) -> ArrayContext:
         raise NotImplementedError(actx_t)
 
 
+def _free_held_memory(actx: ArrayContext) -> None:
+    """
+    Releases the device memory held by the memory pool of *actx* (if any), so
+    that a benchmark does not start with the blocks freed by the previous one.
+    """
+    allocator = getattr(actx, "allocator", None)
+    # pycuda's pool is passed to the array context as its bound 'allocate'
+    pool = getattr(allocator, "__self__", allocator)
+
+    if hasattr(pool, "free_held"):
+        pool.free_held()
+
+
+# Holds at most one array context: the one used by the latest benchmark.
+_ACTX_T_TO_ACTX: Dict[Type[ArrayContext], ArrayContext] = {}
+
+
+def _get_actx(actx_t: Type[ArrayContext]) -> ArrayContext:
+    """
+    Returns an instance of *actx_t* shared across consecutive benchmarks run
+    with *actx_t* to avoid setting up a context, queue, allocator per
+    benchmark. The array context of the previous benchmark, if of a different
+    type, is released before instantiating *actx_t*.
+    """
+    import gc
+
+    try:
+        return _ACTX_T_TO_ACTX[actx_t]
+    except KeyError:
+        pass
+
+    if _ACTX_T_TO_ACTX:
+        prev_actx_t, = _ACTX_T_TO_ACTX
+        _free_held_memory(_ACTX_T_TO_ACTX.pop(prev_actx_t))
+        gc.collect()
+
+    actx = _instantiate_actx_t(actx_t)
+    _ACTX_T_TO_ACTX[actx_t] = actx
+    return actx
+
+
+def _timed_loop(f: Callable[..., Any], args: Tuple[Any, ...],
+                kwargs: Dict[str, Any], *,
+                max_calls: int, max_time: float, batch_size: int
+                ) -> Tuple[int, int]:
+    """
+    Invokes *f* in batches of *batch_size* calls until *max_calls* calls are
+    made or *max_time* seconds have elapsed. Returns the number of calls made
+    and the time they took in nanoseconds.
+    """
+    max_time_ns = max_time * 1e9
+    ncalls = 0
+    t_ns = 0
+
+    while ncalls < max_calls and t_ns < max_time_ns:
+        t_start = perf_counter_ns()
+        # iterating over 'repeat' avoids allocating an int per iteration, as
+        # done in timeit's inner loop.
+        for _ in repeat(None, batch_size):
+            f(*args, **kwargs)
+        t_ns += perf_counter_ns() - t_start
+        ncalls += batch_size
+
+    return ncalls, t_ns
+
+
 def get_flop_rate(actx_t: Type[ArrayContext], equation: str, dim: int,
                   degree: int) -> float:
     """
@@ -62,8 +126,12 @@ def get_flop_rate(actx_t: Type[ArrayContext], equation: str, dim: int,
     import pickle
     from dg_benchmarks.utils import is_dataclass_array_container
 
+    import gc
+    gc.collect()
+
     rhs_invoker = get_benchmark_rhs_invoker(equation, dim, degree)
-    actx = _instantiate_actx_t(actx_t)
+    actx = _get_actx(actx_t)
+    _free_held_memory(actx)
     rhs_clbl = rhs_invoker(actx)
 
     with open(get_benchmark_ref_input_arguments_path(equation, dim, degree),
@@ -82,7 +150,12 @@ def get_flop_rate(actx_t: Type[ArrayContext], equation: str, dim: int,
                          for el in arg))
              or np.isscalar(arg))
             for arg in np_args)
-            and all(is_dataclass_array_container(arg) or np.isscalar(arg)
+            and all((is_dataclass_array_container(arg)
+                     or (isinstance(arg, np.ndarray)
+                         and arg.dtype == "O"
+                         and all(is_dataclass_array_container(el)
+                                 for el in arg))
+                     or np.isscalar(arg))
                     for arg in np_kwargs.values())):
         args, kwargs = np_args, np_kwargs
     elif (any(is_dataclass_array_container(arg) for arg in np_args)
@@ -111,35 +184,18 @@ def get_flop_rate(actx_t: Type[ArrayContext], equation: str, dim: int,
 
     # {{{ warmup rounds
 
-    i_warmup = 0
-    t_warmup = 0
-
-    while i_warmup < 20 and t_warmup < 2:
-        t_start = time()
-        rhs_clbl(*args, **kwargs)
-        t_end = time()
-        t_warmup += (t_end - t_start)
-        i_warmup += 1
+    _timed_loop(rhs_clbl, args, kwargs,
+                max_calls=20, max_time=2, batch_size=1)
 
     # }}}
 
-    # {{{ warmup rounds
-
-    i_timing = 0
-    t_rhs = 0
-
-    while i_timing < 100 and t_rhs < 5:
-
-        t_start = time()
-        for _ in range(40):
-            rhs_clbl(*args, **kwargs)
-        t_end = time()
+    # {{{ timing rounds
 
-        t_rhs += (t_end - t_start)
-        i_timing += 40
+    ncalls, t_rhs = _timed_loop(rhs_clbl, args, kwargs,
+                                max_calls=100, max_time=5, batch_size=40)
 
     # }}}
 
     flops = get_float64_flops(equation, dim, degree)
 
-    return (flops * i_timing) / t_rhs
+    return (flops * ncalls) / (t_rhs * 1e-9)
@@ -224,7 +224,12 @@ def _get_min_flops_kernel(equation: str,
                          for el in arg))
              or np.isscalar(arg))
             for arg in np_args)
-            and all(is_dataclass_array_container(arg) or np.isscalar(arg)
+            and all((is_dataclass_array_container(arg)
+                     or (isinstance(arg, np.ndarray)
+                         and arg.dtype == "O"
+                         and all(is_dataclass_array_container(el)
+                                 for el in arg))
+                     or np.isscalar(arg))
                     for arg in np_kwargs.values())):
         args, kwargs = np_args, np_kwargs
     elif (any(is_dataclass_array_container(arg) for arg in np_args)
@@ -274,7 +279,12 @@ def _get_min_bytes_kernel(equation: str,
                          for el in arg))
              or np.isscalar(arg))
             for arg in np_args)
-            and all(is_dataclass_array_container(arg) or np.isscalar(arg)
+            and all((is_dataclass_array_container(arg)
+                     or (isinstance(arg, np.ndarray)
+                         and arg.dtype == "O"
+                         and all(is_dataclass_array_container(el)
+                                 for el in arg))
+                     or np.isscalar(arg))
                     for arg in np_kwargs.values())):
         args, kwargs = np_args, np_kwargs
     elif (any(is_dataclass_array_container(arg) for arg in np_args)
@@ -427,6 +437,6 @@ def get_roofline_flop_rate(equation: str, dim: int, degree: int,
         except KeyError:
             return np.nan
         else:
-            return get_float64_flops(equation, dim, degree)/t_runtime
+            return nflops/t_runtime
     else:
         raise NotImplementedError("Unknown roofline model:", roofline_model)
@@ -7,17 +7,19 @@ import argparse
 import loopy as lp
 import numpy as np
 import datetime
-import pytz
 
 from dg_benchmarks.measure import get_flop_rate
 from dg_benchmarks.perf_analysis import get_roofline_flop_rate
-from typing import Type, Sequence
-from bidict import bidict
+from functools import cache
+from itertools import product
+from typing import Type, Sequence, TYPE_CHECKING
 from meshmode.array_context import (
     PyOpenCLArrayContext as BasePyOpenCLArrayContext,
 )
 from arraycontext import ArrayContext, PytatoJAXArrayContext, EagerJAXArrayContext, PytatoCUDAGraphArrayContext
-from tabulate import tabulate
+
+if TYPE_CHECKING:
+    from bidict import bidict
 
 
 class PyOpenCLArrayContext(BasePyOpenCLArrayContext):
@@ -51,26 +53,28 @@ def main(equations: Sequence[str],
          degrees: Sequence[int],
          actx_ts: Sequence[Type[ArrayContext]],
          ):
+    import pytz
+    from tabulate import tabulate
+
     flop_rate = np.empty([len(actx_ts), len(dims), len(equations), len(degrees)])
     roofline_flop_rate = np.empty([len(dims), len(equations), len(degrees)])
 
     # sorting `actx_ts` to run JAX related operations at the end as they only
     # free the device memory atexit
-    for iactx_t, actx_t in sorted(enumerate(actx_ts),
-                                  key=lambda k: _get_actx_t_priority(k[1])):
-        for idim, dim in enumerate(dims):
-            for iequation, equation in enumerate(equations):
-                for idegree, degree in enumerate(degrees):
-                    flop_rate[iactx_t, idim, iequation, idegree] = (
-                        get_flop_rate(actx_t, equation, dim, degree)
-                    )
-
-    for idim, dim in enumerate(dims):
-        for iequation, equation in enumerate(equations):
-            for idegree, degree in enumerate(degrees):
-                roofline_flop_rate[idim, iequation, idegree] = (
-                    get_roofline_flop_rate(equation, dim, degree)
-                )
+    actx_order = sorted(range(len(actx_ts)),
+                        key=lambda iactx_t: _get_actx_t_priority(actx_ts[iactx_t]))
+
+    for iactx_t, (idim, dim), (iequation, equation), (idegree, degree) in product(
+            actx_order, enumerate(dims), enumerate(equations), enumerate(degrees)):
+        flop_rate[iactx_t, idim, iequation, idegree] = (
+            get_flop_rate(actx_ts[iactx_t], equation, dim, degree)
+        )
+
+    for (idim, dim), (iequation, equation), (idegree, degree) in product(
+            enumerate(dims), enumerate(equations), enumerate(degrees)):
+        roofline_flop_rate[idim, iequation, idegree] = (
+            get_roofline_flop_rate(equation, dim, degree)
+        )
     filename = (datetime
                 .datetime
                 .now(pytz.timezone("America/Chicago"))
@@ -85,7 +89,7 @@ def main(equations: Sequence[str],
         for iequation, equation in enumerate(equations):
             print(f"GFLOPS/s for {dim}D-{equation}:")
             table = [["",
-                      *[_NAME_TO_ACTX_CLASS.inv[actx_t]
+                      *[_get_name_to_actx_class().inv[actx_t]
                         for actx_t in actx_ts],
                       "Roofline"]]
             for idegree, degree in enumerate(degrees):
@@ -99,12 +103,15 @@ def main(equations: Sequence[str],
             print(tabulate(table, tablefmt="fancy_grid"))
 
 
-_NAME_TO_ACTX_CLASS = bidict({
-    "pyopencl": PyOpenCLArrayContext,
-    "jax:nojit": EagerJAXArrayContext,
-    "jax:jit": PytatoJAXArrayContext,
-    "cudagraph": PytatoCUDAGraphArrayContext,
-})
+@cache
+def _get_name_to_actx_class() -> "bidict[str, Type[ArrayContext]]":
+    from bidict import bidict
+    return bidict({
+        "pyopencl": PyOpenCLArrayContext,
+        "jax:nojit": EagerJAXArrayContext,
+        "jax:jit": PytatoJAXArrayContext,
+        "cudagraph": PytatoCUDAGraphArrayContext,
+    })
 
 
 if __name__ == "__main__":
@@ -144,5 +151,5 @@ if __name__ == "__main__":
     main(equations=[k.strip() for k in args.equations.split(",")],
          dims=[int(k.strip()) for k in args.dims.split(",")],
          degrees=[int(k.strip()) for k in args.degrees.split(",")],
-         actx_ts=[_NAME_TO_ACTX_CLASS[k] for k in args.actxs.split(",")],
+         actx_ts=[_get_name_to_actx_class()[k] for k in args.actxs.split(",")],
          )
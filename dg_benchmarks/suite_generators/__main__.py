@@ -6,7 +6,8 @@ A binary for running DG-FEM benchmarks for an array of arraycontexts. Call as
 import argparse
 
 from typing import Sequence
-from dg_benchmarks.codegen import SuiteGeneratingArraycontext
+from dg_benchmarks.codegen import (SuiteGeneratingArraycontext,
+                                   format_generated_sources)
 from dg_benchmarks import utils
 import pyopencl as cl
 import pyopencl.tools as cl_tools
@@ -29,6 +30,11 @@ def get_actx(equation: str, dim: int, degree: int) -> SuiteGeneratingArraycontex
             equation, dim, degree),
         pickled_ref_output_path=utils.get_benchmark_ref_output_path(
             equation, dim, degree),
+        # the suite ships the reference outputs => evaluate and check them.
+        verify_codegen=True,
+        # the cache does not track the libraries the operators call into =>
+        # always regenerate the shipped files.
+        use_codegen_cache=False,
     )
 
 
@@ -36,6 +42,8 @@ def main(equations: Sequence[str],
          dims: Sequence[int],
          degrees: Sequence[int],
          ):
+    main_file_paths = []
+
     for dim in dims:
         for equation in equations:
             for degree in degrees:
@@ -58,10 +66,17 @@ def main(equations: Sequence[str],
                 else:
                     raise NotImplementedError(equation, dim, degree)
 
+                main_file_paths.append(
+                    utils.get_benchmark_main_file_path(equation, dim, degree))
+
                 print(75*"-")
                 print(f"Done generating {equation}_{dim}D_P{degree}")
                 print(75*"-")
 
+    # format all the generated files in a single black invocation rather than
+    # once per compiled function.
+    format_generated_sources(*main_file_paths)
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -7,10 +7,11 @@ import pyopencl.tools as cl_tools
 import tempfile
 
 
-def _get_suite_generating_actx(ctx):
+def _get_suite_generating_actx(ctx, tempdir=None):
     cq = cl.CommandQueue(ctx)
     allocator = cl_tools.MemoryPool(cl_tools.ImmediateAllocator(cq))
-    tempdir = tempfile.mkdtemp()
+    if tempdir is None:
+        tempdir = tempfile.mkdtemp()
 
     return SuiteGeneratingArraycontext(
         cq, allocator,
@@ -18,6 +19,7 @@ def _get_suite_generating_actx(ctx):
         datawrappers_path=f"{tempdir}/datawrappers.npz",
         pickled_ref_input_args_path=f"{tempdir}/ref_input_args.npz",
         pickled_ref_output_path=f"{tempdir}/ref_output.npz",
+        verify_codegen=True,
     )
 
 
@@ -50,3 +52,118 @@ def test_array_container_returning_function(ctx_factory):
 
     a = actx.zeros(10, "float32")
     actx.compile(f)(actx.thaw(actx.freeze(a+1729)))
+
+
+def test_kernel_free_program_imports(ctx_factory):
+    import ast
+    import numpy as np
+    import pytato as pt
+    from dg_benchmarks.codegen.pytato_target import generate_arraycontext_code
+
+    cl_ctx = ctx_factory()
+    actx = _get_suite_generating_actx(cl_ctx)
+
+    x = pt.make_placeholder("x", (10,), np.float64)
+    prg = generate_arraycontext_code(pt.make_dict_of_named_arrays({"out": 2*x}),
+                                     actx=actx,
+                                     function_name="_rhs_inner")
+    import_statements = {ast.unparse(stmt) for stmt in prg.import_statements}
+
+    # numpy is relied upon by the host code even if the function doesn't use it
+    assert "import numpy as np" in import_statements
+    assert "import loopy as lp" not in import_statements
+    assert ("from arraycontext import make_loopy_program"
+            not in import_statements)
+
+
+def test_remove_dead_assignments():
+    import ast
+    from dg_benchmarks.codegen.pytato_target import _remove_dead_assignments
+
+    lines = ast.parse("\n".join([
+        "_pt_data = actx.thaw(npzfile['_pt_data'])",
+        "_pt_data = actx.tag((FirstAxisIsElementsTag(),), _pt_data)",
+        "_pt_data_0 = actx.thaw(npzfile['_pt_data_0'])",
+        "_pt_data_0 = actx.tag((FirstAxisIsElementsTag(),), _pt_data_0)",
+        "_pt_tmp = actx.call_loopy(_pt_t_unit, x=_pt_data_0)['out']",
+        "_pt_tmp_0 = 2 * _pt_tmp",
+        "return _pt_tmp",
+    ])).body
+
+    assert ([ast.unparse(line) for line in _remove_dead_assignments(lines)]
+            == ["_pt_data_0 = actx.thaw(npzfile['_pt_data_0'])",
+                "_pt_data_0 = actx.tag((FirstAxisIsElementsTag(),), _pt_data_0)",
+                "_pt_tmp = actx.call_loopy(_pt_t_unit, x=_pt_data_0)['out']",
+                "return _pt_tmp"])
+
+
+def test_codegen_cache_hit(ctx_factory, monkeypatch):
+    import numpy as np
+    from dg_benchmarks import codegen
+    from dg_benchmarks.codegen import LazilyArraycontextCompilingFunctionCaller
+
+    cl_ctx = ctx_factory()
+    tempdir = tempfile.mkdtemp()
+
+    # only functions named 'rhs' go through the codegen
+    def rhs(x):
+        return 2*x
+
+    actx = _get_suite_generating_actx(cl_ctx, tempdir)
+    actx.compile(rhs)(actx.thaw(actx.freeze(actx.zeros(10, "float64") + 42)))
+
+    load_compiled_func = (
+        LazilyArraycontextCompilingFunctionCaller._load_compiled_func)
+    nloads = []
+
+    def _counting_load_compiled_func(self):
+        nloads.append(None)
+        return load_compiled_func(self)
+
+    monkeypatch.setattr(LazilyArraycontextCompilingFunctionCaller,
+                        "_load_compiled_func",
+                        _counting_load_compiled_func)
+    # emulate a fresh process => the host code must be imported from disk
+    generated_modules = {}
+    monkeypatch.setattr(codegen, "_GENERATED_MODULE_NAME_TO_MODULE",
+                        generated_modules)
+
+    # a new array context writing to the same paths must re-use the files
+    actx = _get_suite_generating_actx(cl_ctx, tempdir)
+    result = actx.compile(rhs)(
+        actx.thaw(actx.freeze(actx.zeros(10, "float64") + 1729)))
+
+    assert len(nloads) == 1
+    module, = generated_modules.values()
+    assert module.__file__ == f"{tempdir}/main.py"
+    np.testing.assert_allclose(actx.to_numpy(result), 2*1729)
+
+
+def test_write_if_changed(monkeypatch):
+    import os
+    from dg_benchmarks import codegen
+
+    filepath = os.path.join(tempfile.mkdtemp(), "data.pkl")
+    nwrites = []
+
+    def _counting_open(file, mode="r", *args, **kwargs):
+        if "w" in mode and file == filepath:
+            nwrites.append(None)
+        return open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr(codegen, "open", _counting_open, raising=False)
+
+    codegen._write_if_changed(filepath, b"dg-fem")
+    assert len(nwrites) == 1
+
+    # unchanged contents => skip the write
+    codegen._write_if_changed(filepath, b"dg-fem")
+    assert len(nwrites) == 1
+
+    # file replaced by other means => overwritten despite matching digest
+    with open(filepath, "wb") as fp:
+        fp.write(b"downloaded")
+    codegen._write_if_changed(filepath, b"dg-fem")
+    assert len(nwrites) == 2
+    with open(filepath, "rb") as fp:
+        assert fp.read() == b"dg-fem"